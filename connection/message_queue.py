@@ -227,6 +227,10 @@ def image_received(image_path: str, metadata: Dict[str, Any], client_addr: str)
     """
     Notify that an image was received from a client.
     
+    Never blocks: the event is enqueued with put_nowait and dropped if the queue is
+    full, and the GUI thread does the actual handling in process_messages. It is
+    therefore safe to call from the frame processing path.
+    
     Args:
         image_path: Path to the saved image
         metadata: Image metadata
@@ -52,6 +52,35 @@ is_processing_frame = False # Global flag to track if a frame is currently being
 # Create a lock for frame processing to prevent race conditions
 processing_lock = asyncio.Lock()
 
+# Maximum number of received frames per client waiting for analysis
+FRAME_QUEUE_SIZE = 2
+
+def _split_combined_frame(message: bytes) -> Optional[Tuple[Dict[str, Any], bytes]]:
+    """
+    Splits a binary message that carries both metadata and image.
+    
+    Layout: 4-byte big-endian metadata length, UTF-8 JSON metadata, image bytes.
+    
+    Args:
+        message: Binary WebSocket message
+        
+    Returns:
+        tuple or None: (metadata, image bytes), or None if the message is not in this format
+    """
+    if len(message) < 5:
+        return None
+    meta_len = int.from_bytes(message[:4], "big")
+    # Raw JPG/PNG data decodes to a length far beyond the message size
+    if 4 + meta_len > len(message) or message[4:5] != b"{":
+        return None
+    try:
+        metadata = json.loads(message[4:4 + meta_len])
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if not isinstance(metadata, dict):
+        return None
+    return metadata, message[4 + meta_len:]
+
 def _get_temp_frames_abs_dir() -> str:
     """
     Determines the absolute path to the temporary frames directory.
@@ -261,11 +290,11 @@ async def process_frame_with_metadata(
         logging.info(f"Frame metadata: timestamp={timestamp}, dimensions={width}x{height}, camera_pose={camera_pose}")
         
         # Store current frame count before adding new image
-        frame_count_before = len(video_state.get_images())
+        frame_count_before = len(video_state)
         
         # Add to video state
-        video_state.add_image(image_file_path)
-        logging.debug(f"VideoState updated. Current images for task '{current_task_state.task.name}': {len(video_state.get_images())}")
+        video_state.add_image(image_file_path, image_data)
+        logging.debug(f"VideoState updated. Current images for task '{current_task_state.task.name}': {len(video_state)}")
         
         # Publish video state change to GUI
         state_changed("video", {
@@ -318,7 +347,11 @@ async def process_frame_with_metadata(
         # )
         
         # Process the frame and send results
-        current_status = processFrame.processFrame(current_task_state, video_state, allow_visualization)
+        current_status = await processFrame.processFrame_async(current_task_state, video_state, allow_visualization)
+        if current_status is None:
+            # Debounced: no analysis ran, so leave the last instruction and GUI status untouched
+            logging.debug("Frame analysis skipped, previous analysis was too recent")
+            return True
         logging.info(f"Current status: {current_status}")
         log_message("info", f"Frame processing result: {current_status}", "server")
         
@@ -345,7 +378,7 @@ async def process_frame_with_metadata(
         if current_status == "derailed":
             try:
                 # Get the most recent image path
-                latest_image = video_state.get_images()[-1] if video_state.get_images() else None
+                latest_image = video_state.images[-1] if len(video_state) else None
                 if latest_image:
                     instruction = ARGlassesInstruction.from_step('derailed', current_task_state.getCurrentStep())
                     
@@ -398,7 +431,7 @@ async def process_frame_with_metadata(
             
             # Get the most recent image path to detect object coordinates
             try:
-                latest_image = video_state.get_images()[-1] if video_state.get_images() else None
+                latest_image = video_state.images[-1] if len(video_state) else None
                 if latest_image:
                     # Add object coordinates to the next instruction
                     next_instruction = next_instruction.addObjectCoordinates(
@@ -479,6 +512,9 @@ async def new_frame_handler(websocket: WebSocketServerProtocol, path: Optional[s
     1. JSON metadata message
     2. Binary JPG image data
     
+    or a single binary message with a 4-byte big-endian metadata length,
+    the JSON metadata and the image data.
+    
     Args:
         websocket: The WebSocket connection object
         path: The connection path (unused but was required by older websockets versions)
@@ -514,9 +550,52 @@ async def new_frame_handler(websocket: WebSocketServerProtocol, path: Optional[s
     expecting_metadata = True
     current_metadata: Optional[Dict[str, Any]] = None
     
+    # Frames saved by the reader loop below and waiting for analysis. The queue is
+    # bounded so that a slow model call applies back-pressure to the reader.
+    frame_queue: asyncio.Queue = asyncio.Queue(maxsize=FRAME_QUEUE_SIZE)
+    
+    async def compute_frames() -> None:
+        """Analyzes queued frames in arrival order while the reader keeps receiving."""
+        while True:
+            image_data, metadata, image_file_path = await frame_queue.get()
+            
+            # Check if the lock is already held (processor is busy with another client)
+            if processing_lock.locked():
+                logging.info(f"⟸ Processor busy, dropping frame from {client_addr}")
+                log_message("warning", f"Processor busy, dropping frame", "server")
+                continue
+            
+            # Process the frame while holding the lock
+            try:
+                async with processing_lock:
+                    await process_frame_with_metadata(
+                        websocket,
+                        image_data,
+                        metadata,
+                        client_addr,
+                        temp_frames_abs_dir,
+                        client_frames,
+                        image_file_path,
+                        True  # Always allow visualization
+                    )
+            except Exception as e:
+                # Keep draining the queue so the reader never blocks on a dead consumer
+                logging.error(f"Error processing queued frame from {client_addr}: {e}")
+                log_message("error", f"Error processing queued frame: {e}", "server")
+    
+    compute_task = asyncio.create_task(compute_frames())
+    
     try:
         # Process messages from this connection
         async for message in websocket:
+            # Metadata and image may also arrive together in one length-prefixed binary frame
+            if expecting_metadata and isinstance(message, bytes):
+                combined = _split_combined_frame(message)
+                if combined is not None:
+                    current_metadata, message = combined
+                    expecting_metadata = False
+                    websocket_logger.log_incoming_message(current_metadata)
+            
             if expecting_metadata and isinstance(message, str):
                 # First message should be metadata JSON
                 try:
@@ -574,14 +653,6 @@ async def new_frame_handler(websocket: WebSocketServerProtocol, path: Optional[s
                     current_metadata = None
                     continue
                 
-                # Check if the lock is already held (processor is busy)
-                if processing_lock.locked():
-                    logging.info(f"⟸ Processor busy, dropping frame from {client_addr}")
-                    log_message("warning", f"Processor busy, dropping frame", "server")
-                    expecting_metadata = True  # Reset, expecting metadata again
-                    current_metadata = None
-                    continue
-
                 # Create a copy of the metadata and other values needed for processing
                 metadata_copy = current_metadata.copy() if current_metadata else {}
                 
@@ -589,18 +660,8 @@ async def new_frame_handler(websocket: WebSocketServerProtocol, path: Optional[s
                 expecting_metadata = True
                 current_metadata = None
                 
-                # Process the frame while holding the lock
-                async with processing_lock:
-                    await process_frame_with_metadata(
-                        websocket,
-                        message,
-                        metadata_copy,
-                        client_addr,
-                        temp_frames_abs_dir,
-                        client_frames,
-                        image_file_path,
-                        True  # Always allow visualization
-                    )
+                # Hand the frame to the compute stage; waits while the queue is full
+                await frame_queue.put((message, metadata_copy, image_file_path))
                     
             else:
                 # Handle unexpected message type
@@ -627,6 +688,13 @@ async def new_frame_handler(websocket: WebSocketServerProtocol, path: Optional[s
         log_message("error", f"Unhandled WebSocket error: {e}", "server")
         traceback.print_exc()
     finally:
+        # Stop analyzing frames for a client that is gone
+        compute_task.cancel()
+        try:
+            await compute_task
+        except asyncio.CancelledError:
+            pass
+        
         # Clean up client connection
         if websocket in connected_clients:
             connected_clients.remove(websocket)
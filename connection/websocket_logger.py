@@ -249,7 +249,7 @@ class WebSocketLogger:
             "allow_visualization": allow_visualization,
             "task_name": task_state.task.name if task_state and task_state.task else "None",
             "current_step": task_state.index + 1 if task_state else 0,
-            "images_count": len(video_state.get_images()) if video_state else 0,
+            "images_count": len(video_state) if video_state is not None else 0,
             "images": video_state.get_images() if video_state else []
         }
         
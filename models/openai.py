@@ -1,7 +1,8 @@
 import os
 import base64
+import asyncio
 import logging
-from typing import List, Dict, Union
+from typing import List, Dict, Optional, Union
 from dotenv import load_dotenv
 
 # Use the Langfuse openai wrapper instead of the regular openai
@@ -10,6 +11,20 @@ from langfuse.openai import openai
 # Load environment variables
 load_dotenv()
 
+# Shared async client, so frames reuse one connection pool instead of opening a new
+# one (and a new TLS handshake) per call. Rebuilt if the API key or event loop changes.
+_async_client = None
+_async_client_key = None
+
+def _get_async_client(api_key: str):
+    """Returns the shared AsyncOpenAI client for this API key and the running event loop."""
+    global _async_client, _async_client_key
+    key = (api_key, asyncio.get_running_loop())
+    if _async_client is None or _async_client_key != key:
+        _async_client = openai.AsyncOpenAI(api_key=api_key)
+        _async_client_key = key
+    return _async_client
+
 class OpenAI:
     @staticmethod
     def _encode_image_to_base64(image_path: str) -> str:
@@ -25,7 +40,7 @@ class OpenAI:
             raise
 
     @staticmethod
-    def frameAnalysis(prompt: str, image_paths: List[str]) -> str:
+    def frameAnalysis(prompt: str, image_paths: List[str], image_bytes: Optional[List[bytes]] = None) -> str:
         """
         Sends a prompt and a list of image paths to gpt-4-mini for processing.
         Uses the Langfuse OpenAI wrapper for automatic monitoring.
@@ -33,6 +48,8 @@ class OpenAI:
         Args:
             prompt: The text prompt to send to the model.
             image_paths: A list of file paths to the images.
+            image_bytes: Optional contents of the files in image_paths, already read by the
+                caller. When given, the files are not read again.
 
         Returns:
             The text response from the model.
@@ -48,16 +65,90 @@ class OpenAI:
         # Create OpenAI client using Langfuse wrapper
         client = openai.OpenAI(api_key=api_key)
 
+        messages_content = OpenAI._build_messages_content(prompt, image_paths, image_bytes)
+
+        try:
+            # Make the API call - tracing is automatic with the Langfuse openai wrapper
+            response = client.chat.completions.create(
+                model="gpt-4o",
+                messages=[
+                    {
+                        "role": "user",
+                        "content": messages_content
+                    }
+                ],
+                max_tokens=10000  # Adjust as needed
+            )
+            return OpenAI._extract_content(response)
+
+        except Exception as e:
+            OpenAI._raise_api_error(e)
+
+    @staticmethod
+    async def frameAnalysis_async(prompt: str, image_paths: List[str], image_bytes: Optional[List[bytes]] = None) -> str:
+        """
+        Async variant of frameAnalysis that awaits the request on an AsyncOpenAI client,
+        so several frames can be analyzed concurrently from the event loop.
+
+        Args:
+            prompt: The text prompt to send to the model.
+            image_paths: A list of file paths to the images.
+            image_bytes: Optional contents of the files in image_paths, already read by the
+                caller. When given, the files are not read again.
+
+        Returns:
+            The text response from the model.
+            
+        Raises:
+            RuntimeError: If the OpenAI API key is not set or if the API call fails.
+        """
+        # Get API key
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise RuntimeError("OPENAI_API_KEY environment variable not set.")
+
+        # Shared async OpenAI client using Langfuse wrapper
+        client = _get_async_client(api_key)
+
+        messages_content = OpenAI._build_messages_content(prompt, image_paths, image_bytes)
+
+        try:
+            response = await client.chat.completions.create(
+                model="gpt-4o",
+                messages=[
+                    {
+                        "role": "user",
+                        "content": messages_content
+                    }
+                ],
+                max_tokens=10000  # Adjust as needed
+            )
+            return OpenAI._extract_content(response)
+
+        except Exception as e:
+            OpenAI._raise_api_error(e)
+
+    @staticmethod
+    def _build_messages_content(prompt: str, image_paths: List[str], image_bytes: Optional[List[bytes]] = None) -> List[Dict]:
+        """Builds the user message content from the text prompt and the base64-encoded images."""
         # Prepare message content with text prompt
         messages_content = [{"type": "text", "text": prompt}]
         
         # Add images to message content
-        for image_path in image_paths:
+        for i, image_path in enumerate(image_paths):
             try:
-                base64_image = OpenAI._encode_image_to_base64(image_path)
-                # Determine image type from file extension
+                if image_bytes is not None:
+                    base64_image = base64.b64encode(image_bytes[i]).decode('utf-8')
+                else:
+                    base64_image = OpenAI._encode_image_to_base64(image_path)
+                # Determine image type from the data when available (the caller may have
+                # re-encoded it), otherwise from the file extension
                 image_type = os.path.splitext(image_path)[1].lower()
-                if image_type in ['.jpg', '.jpeg']:
+                if image_bytes is not None and image_bytes[i].startswith(b'\xff\xd8'):
+                    mime_type = 'image/jpeg'
+                elif image_bytes is not None and image_bytes[i].startswith(b'\x89PNG'):
+                    mime_type = 'image/png'
+                elif image_type in ['.jpg', '.jpeg']:
                     mime_type = 'image/jpeg'
                 elif image_type == '.png':
                     mime_type = 'image/png'
@@ -68,40 +159,36 @@ class OpenAI:
                     "type": "image_url", 
                     "image_url": {
                         "url": f"data:{mime_type};base64,{base64_image}",
-                        "detail": "high"
+                        # Coarse structure is enough to judge task progress; "low" bills a
+                        # fixed 85 tokens per image instead of per 512px tile
+                        "detail": "low"
                     }
                 })
             except Exception as e:
                 print(f"Skipping image {image_path} due to encoding error: {e}")
                 raise RuntimeError(f"Failed to encode image {image_path}") from e
 
-        try:
-            # Make the API call - tracing is automatic with the Langfuse openai wrapper
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": messages_content
-                    }
-                ],
-                max_tokens=10000  # Adjust as needed
-            )
-            
-            if response.choices and response.choices[0].message and response.choices[0].message.content:
-                return response.choices[0].message.content
-            else:
-                raise RuntimeError("Failed to get a valid response from OpenAI API.")
+        return messages_content
 
-        except openai.APIConnectionError as e:
+    @staticmethod
+    def _extract_content(response) -> str:
+        """Returns the text of the first choice, raising RuntimeError if the response is empty."""
+        if response.choices and response.choices[0].message and response.choices[0].message.content:
+            return response.choices[0].message.content
+        else:
+            raise RuntimeError("Failed to get a valid response from OpenAI API.")
+
+    @staticmethod
+    def _raise_api_error(e: Exception) -> None:
+        """Re-raises an error from the OpenAI call as a RuntimeError with a descriptive message."""
+        if isinstance(e, openai.APIConnectionError):
             print(f"OpenAI API Connection Error: {e}")
             raise RuntimeError(f"OpenAI API Connection Error: {e}") from e
-        except openai.RateLimitError as e:
+        if isinstance(e, openai.RateLimitError):
             print(f"OpenAI API Rate Limit Error: {e}")
             raise RuntimeError(f"OpenAI API Rate Limit Error: {e}") from e
-        except openai.APIStatusError as e:
+        if isinstance(e, openai.APIStatusError):
             print(f"OpenAI API Status Error: {e}")
             raise RuntimeError(f"OpenAI API Status Error: {e}") from e
-        except Exception as e:
-            print(f"An unexpected error occurred while calling OpenAI API: {e}")
-            raise RuntimeError(f"An unexpected error occurred: {e}") from e
+        print(f"An unexpected error occurred while calling OpenAI API: {e}")
+        raise RuntimeError(f"An unexpected error occurred: {e}") from e
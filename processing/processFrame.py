@@ -1,6 +1,12 @@
-from typing import TYPE_CHECKING, Literal
-import json
+from typing import TYPE_CHECKING, Dict, List, Literal, Optional, Tuple
+import asyncio
+import hashlib
+import io
+import re
+import time
 import traceback
+import orjson
+import diskcache
 from states.VideoState import VideoState
 from models.openai import OpenAI
 from processing.ar_glasses_instruction import ARGlassesInstruction, ObjectInfo
@@ -13,12 +19,213 @@ import datetime
 
 if TYPE_CHECKING:
     from states.TaskState import TaskState # Forward reference for TaskState
+    from tasks.Step import Step
+
+# Print full tracebacks for handled errors only when FRAME_DEBUG=1; otherwise just log the message
+_DEBUG = os.getenv("FRAME_DEBUG") == "1"
+
+# Resolve the overlay font once at import instead of on every visualization
+try:
+    # Try to use a system font
+    _FONT = ImageFont.truetype("Arial", 16)
+except Exception:
+    # Fall back to default font
+    _FONT = ImageFont.load_default()
+
+# Directory for visualization images, created on the first visualization rather than at import
+_TMP_DIR: Optional[str] = None
+
+def _tmp_dir() -> str:
+    """Returns media/tmp_frames under the working directory, creating it on the first call."""
+    global _TMP_DIR
+    if _TMP_DIR is None:
+        tmp_dir = os.path.join(os.getcwd(), "media", "tmp_frames")
+        os.makedirs(tmp_dir, exist_ok=True)
+        _TMP_DIR = tmp_dir
+    return _TMP_DIR
+
+# Overlay color and label for each status returned by the model
+_STATUS_STYLES = {
+    "executing_task": ((0, 128, 0, 180), "Status: EXECUTING TASK"),  # Green
+    "completed_task": ((0, 0, 255, 180), "Status: COMPLETED TASK"),  # Blue
+    "derailed": ((255, 0, 0, 180), "Status: DERAILED"),  # Red
+}
+_ERROR_STYLE = ((128, 128, 128, 180), "Status: ERROR")  # Gray
+
+# Matches the outermost JSON object embedded in a free-text model response
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Frames whose average hashes differ in fewer bits than this are treated as duplicates
+_DUPLICATE_HASH_DISTANCE = 6
+
+# Average hashes of recent frames keyed by path, so dedup and the response cache hash each frame once
+_FRAME_HASHES: Dict[str, int] = {}
+_FRAME_HASHES_SIZE = 32
+
+def _average_hash(frame: bytes) -> int:
+    """
+    Computes a 64-bit average hash of an encoded image: an 8x8 grayscale thumbnail
+    thresholded at its median, one bit per pixel.
+    """
+    with Image.open(io.BytesIO(frame)) as img:
+        pixels = list(img.convert("L").resize((8, 8), Image.BILINEAR).getdata())
+    median = sorted(pixels)[32]
+    image_hash = 0
+    for pixel in pixels:
+        image_hash = (image_hash << 1) | (pixel > median)
+    return image_hash
+
+def _frame_hash(image_path: str, frame: bytes) -> int:
+    """Returns the average hash of a frame, computing it only the first time its path is seen."""
+    image_hash = _FRAME_HASHES.get(image_path)
+    if image_hash is None:
+        image_hash = _average_hash(frame)
+        if len(_FRAME_HASHES) >= _FRAME_HASHES_SIZE:
+            _FRAME_HASHES.clear()
+        _FRAME_HASHES[image_path] = image_hash
+    return image_hash
+
+def _dedupe_frames(frames: List[Tuple[str, bytes]]) -> List[Tuple[str, bytes]]:
+    """
+    Drops frames that are perceptually identical to a more recent kept frame.
+
+    The list is walked newest first so that the current frame is always sent.
+    Frames that cannot be hashed are kept.
+
+    Args:
+        frames: (path, bytes) tuples ordered oldest to newest.
+
+    Returns:
+        The remaining frames, still ordered oldest to newest.
+    """
+    kept: List[Tuple[str, bytes]] = []
+    last_hash = None
+    for image_path, frame in reversed(frames):
+        try:
+            image_hash = _frame_hash(image_path, frame)
+        except Exception as e:
+            log_message("warning", f"Could not hash frame {image_path}: {e}", "frame_processor")
+            kept.append((image_path, frame))
+            continue
+        if last_hash is not None and bin(image_hash ^ last_hash).count("1") < _DUPLICATE_HASH_DISTANCE:
+            continue
+        kept.append((image_path, frame))
+        last_hash = image_hash
+    kept.reverse()
+    return kept
+
+# Minimum seconds between two analyses of the same task; calls inside the window are coalesced
+_MIN_INTERVAL = float(os.getenv("FRAME_MIN_INTERVAL", "0.5"))
+_LAST_CALL_TS: Dict[str, float] = {}
+
+def _debounced(task_name: str) -> bool:
+    """Returns True if a frame for this task was analyzed less than _MIN_INTERVAL seconds ago."""
+    now = time.monotonic()
+    if now - _LAST_CALL_TS.get(task_name, float("-inf")) < _MIN_INTERVAL:
+        return True
+    _LAST_CALL_TS[task_name] = now
+    return False
+
+# Introductory part of the prompt
+_PROMPT_INTRO = """Analyze the following sequence of video frames to determine the user's progress on their current task.
+
+You are an AI assistant helping to monitor an Augmented Reality (AR) guided task sequence. I'll provide:
+1. The previous, current, and next steps in the task sequence
+2. Up to three recent video frames (current moment, 1 second ago, and 2 seconds ago)
+
+Your job is to analyze whether the user is:
+- Correctly executing the current task
+- Has completed the current task and ready to move to the next
+- Has become derailed or is performing the wrong action
+"""
+
+# Required response format instructions; the per-step task context goes in between
+_PROMPT_FORMAT_INSTRUCTIONS = """
+RESPONSE FORMAT:
+Return a JSON object with the following structure based on your analysis:
+
+If the user is correctly working on the current task:
+{"status": "executing_task"}
+
+If the user has completed the current task and should proceed to the next step:
+{"status": "completed_task"}
+
+If the user is doing something incorrect or unrelated to the current task:
+{"status": "derailed", "focus_objects": ["object1", "object2"], "action": "precise action description with these objects"}
+
+In all cases, the status field is required. The focus_objects and action fields are only required for "derailed" status.
+"""
+
+# The constant parts around the task context, joined once at import
+_PROMPT_PREFIX = _PROMPT_INTRO + "\n"
+_PROMPT_SUFFIX = "\n" + _PROMPT_FORMAT_INSTRUCTIONS
+
+# Task context prompt sections keyed by (is first step, previous step, current step, next step)
+_PROMPT_TASKS_CACHE: Dict[Tuple[bool, 'Step', 'Step', 'Step'], Tuple[str, str]] = {}
+_PROMPT_TASKS_CACHE_SIZE = 64
+
+# Frames are downscaled to fit this box before upload so the vision model bills fewer tiles
+_UPLOAD_MAX_SIDE = 768
+
+def _downscale_for_upload(frame: bytes) -> bytes:
+    """Re-encodes a frame as JPEG within _UPLOAD_MAX_SIDE x _UPLOAD_MAX_SIDE, or returns it unchanged if it already fits."""
+    with Image.open(io.BytesIO(frame)) as img:
+        if img.width <= _UPLOAD_MAX_SIDE and img.height <= _UPLOAD_MAX_SIDE:
+            return frame
+        img = img.convert("RGB")
+        # Bilinear is enough here; only the model looks at these pixels
+        img.thumbnail((_UPLOAD_MAX_SIDE, _UPLOAD_MAX_SIDE), Image.BILINEAR)
+        buffer = io.BytesIO()
+        img.save(buffer, "JPEG", quality=80)
+        return buffer.getvalue()
+
+# Project root, i.e. the parent of the processing package
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Model responses persisted across restarts, keyed by prompt and frame hashes; LRU-evicted past 512 MB.
+# Opened on first use so importing this module does not touch the disk
+_RESPONSE_CACHE: Optional[diskcache.Cache] = None
+
+def _response_cache() -> diskcache.Cache:
+    """Returns the on-disk response cache under <project root>/media/llm_cache, opening it on the first call."""
+    global _RESPONSE_CACHE
+    if _RESPONSE_CACHE is None:
+        _RESPONSE_CACHE = diskcache.Cache(os.path.join(_PROJECT_ROOT, "media", "llm_cache"), size_limit=512 * 1024 * 1024)
+    return _RESPONSE_CACHE
+
+def _downscale_all(frames: List[bytes]) -> List[bytes]:
+    """Downscales each frame for upload; see _downscale_for_upload."""
+    return [_downscale_for_upload(frame) for frame in frames]
+
+def _response_cache_key(prompt: str, image_paths: List[str]) -> str:
+    """Builds the response cache key from the prompt and the average hash of each frame."""
+    frame_keys = []
+    for image_path in image_paths:
+        image_hash = _FRAME_HASHES.get(image_path)
+        # Frames that could not be hashed fall back to their path, which never matches another frame
+        frame_keys.append(format(image_hash, "016x") if image_hash is not None else image_path)
+    return hashlib.sha256((prompt + "|".join(frame_keys)).encode("utf-8")).hexdigest()
+
+def _cached_response(cache_key: str) -> Optional[str]:
+    """Returns the stored model response for the key, or None on a miss."""
+    response_str = _response_cache().get(cache_key)
+    if response_str is not None:
+        log_message("info", "Using cached frame analysis response", "frame_processor")
+    return response_str
+
+def _store_response(cache_key: str, response_str: str, status: TaskStatus) -> None:
+    """Stores a fresh model response, unless it did not parse to a valid status and should be retried."""
+    if status in _STATUS_STYLES:
+        _response_cache().set(cache_key, response_str)
+
+# Upper bound on concurrent OpenAI frame analyses issued through processFrame_async
+_SEM = asyncio.Semaphore(int(os.getenv("OPENAI_CONCURRENCY", "8")))
 
 class processFrame:
     """A class to process video frames in conjunction with task and video states."""
 
     @staticmethod
-    def processFrame(task_state: 'TaskState', video_state: VideoState, allow_visualization: bool = True) -> TaskStatus:
+    def processFrame(task_state: 'TaskState', video_state: VideoState, allow_visualization: bool = True) -> Optional[TaskStatus]:
         """
         Processes a frame based on the current task and video state by constructing
         a prompt for an AI model and returning a simple status string.
@@ -29,270 +236,314 @@ class processFrame:
             allow_visualization: Flag to control whether to create and send visualizations
 
         Returns:
-            TaskStatus: A literal status string - 'executing_task', 'completed_task', 'derailed', or 'error'
+            TaskStatus: A literal status string - 'executing_task', 'completed_task', 'derailed', or 'error',
+            or None if the frame was skipped because the previous analysis was too recent
+        """
+        # Frames arriving faster than the model can analyze them are skipped; None tells
+        # the caller there is no new result to act on
+        if _debounced(task_state.task.name):
+            return None
+        
+        try:
+            prompt_text, frames, current_step = processFrame._build_request(task_state, video_state)
+            image_paths_to_send = [image_path for image_path, _ in frames]
+            image_bytes = [frame for _, frame in frames]
+            
+            # Reuse a stored response for the same prompt and frames before doing any upload work
+            cache_key = _response_cache_key(prompt_text, image_paths_to_send)
+            response_str = _cached_response(cache_key)
+            fresh = response_str is None
+            if fresh:
+                # Call OpenAI for analysis
+                upload_bytes = _downscale_all(image_bytes)
+                response_str = OpenAI.frameAnalysis(prompt=prompt_text, image_paths=image_paths_to_send, image_bytes=upload_bytes)
+            latest_frame = image_bytes[-1] if image_bytes else None
+            status = processFrame._handle_response(response_str, task_state, current_step, latest_frame, allow_visualization)
+            if fresh:
+                _store_response(cache_key, response_str, status)
+            return status
+            
+        except RuntimeError as e:
+            # Log the error or handle it as per application requirements
+            return processFrame._report_error(f"Error during OpenAI frame analysis: {e}")
+            
+        except Exception as e:
+            return processFrame._report_error(f"An unexpected error occurred in processFrame: {e}")
+
+    @staticmethod
+    async def processFrame_async(task_state: 'TaskState', video_state: VideoState, allow_visualization: bool = True) -> Optional[TaskStatus]:
+        """
+        Async variant of processFrame that awaits the OpenAI call instead of blocking the event loop.
+
+        At most OPENAI_CONCURRENCY (default 8) model calls are in flight at once across all callers.
+
+        Args:
+            task_state: The current state of the task.
+            video_state: The current state of the video (e.g., recent frames).
+            allow_visualization: Flag to control whether to create and send visualizations
+
+        Returns:
+            TaskStatus: A literal status string - 'executing_task', 'completed_task', 'derailed', or 'error',
+            or None if the frame was skipped because the previous analysis was too recent
+        """
+        # Frames arriving faster than the model can analyze them are skipped; None tells
+        # the caller there is no new result to act on
+        if _debounced(task_state.task.name):
+            return None
+        
+        try:
+            # Frame hashing and downscaling are CPU-bound PIL work; run them on the default
+            # executor so the websocket readers keep running meanwhile
+            loop = asyncio.get_running_loop()
+            prompt_text, frames, current_step = await loop.run_in_executor(None, processFrame._build_request, task_state, video_state)
+            image_paths_to_send = [image_path for image_path, _ in frames]
+            image_bytes = [frame for _, frame in frames]
+            
+            # Reuse a stored response for the same prompt and frames before doing any upload work
+            cache_key = _response_cache_key(prompt_text, image_paths_to_send)
+            response_str = _cached_response(cache_key)
+            fresh = response_str is None
+            if fresh:
+                upload_bytes = await loop.run_in_executor(None, _downscale_all, image_bytes)
+                
+                # Call OpenAI for analysis, bounded by the shared concurrency limit
+                async with _SEM:
+                    response_str = await OpenAI.frameAnalysis_async(prompt=prompt_text, image_paths=image_paths_to_send, image_bytes=upload_bytes)
+            latest_frame = image_bytes[-1] if image_bytes else None
+            status = processFrame._handle_response(response_str, task_state, current_step, latest_frame, allow_visualization, offload_visualization=True)
+            if fresh:
+                _store_response(cache_key, response_str, status)
+            return status
+            
+        except RuntimeError as e:
+            return processFrame._report_error(f"Error during OpenAI frame analysis: {e}")
+            
+        except Exception as e:
+            return processFrame._report_error(f"An unexpected error occurred in processFrame: {e}")
+
+    @staticmethod
+    def _build_request(task_state: 'TaskState', video_state: VideoState) -> Tuple[str, List[Tuple[str, bytes]], 'Step']:
+        """
+        Builds the prompt and selects the frames to send for the current task state.
+
+        Args:
+            task_state: The current state of the task.
+            video_state: The current state of the video (e.g., recent frames).
+
+        Returns:
+            A tuple of (prompt text, (path, bytes) frames to send oldest first, current step).
         """
-        previous_step = task_state.getPreviousStep()
         current_step = task_state.getCurrentStep()
-        next_step = task_state.getNextStep()
         
-        is_first_step = task_state.index == 0
+        # The task context only depends on the surrounding step values, so it is built once per
+        # distinct (previous, current, next) triple; Steps are frozen and hash by value
+        cache_key = (task_state.index == 0, task_state.getPreviousStep(), current_step, task_state.getNextStep())
+        cached = _PROMPT_TASKS_CACHE.get(cache_key)
+        if cached is None:
+            cached = processFrame._build_task_context(*cache_key)
+            if len(_PROMPT_TASKS_CACHE) >= _PROMPT_TASKS_CACHE_SIZE:
+                _PROMPT_TASKS_CACHE.clear()
+            _PROMPT_TASKS_CACHE[cache_key] = cached
+        current_step_text, prompt_tasks = cached
         
         # Log that we're starting frame processing
         log_message("info", f"Processing frame for task: {task_state.task.name}", "frame_processor")
-        log_message("info", f"Current step: {current_step.to_human_readable()}", "frame_processor")
+        log_message("info", f"Current step: {current_step_text}", "frame_processor")
 
-        # 1. Construct the introductory part of the prompt
-        prompt_intro = """Analyze the following sequence of video frames to determine the user's progress on their current task.
+        # Combine all parts of the prompt
+        prompt_text = _PROMPT_PREFIX + prompt_tasks + _PROMPT_SUFFIX
 
-You are an AI assistant helping to monitor an Augmented Reality (AR) guided task sequence. I'll provide:
-1. The previous, current, and next steps in the task sequence
-2. Up to three recent video frames (current moment, 1 second ago, and 2 seconds ago)
+        # Get up to the 3 most recent frames as suggested by the prompt ("current", "1s ago", "2s ago"),
+        # newest last. VideoState returns their bytes from memory when the websocket handler
+        # provided them, so they are not read back from disk.
+        frames = video_state.get_recent_decoded(3)
+        
+        # Log how many images we have
+        log_message("info", f"Processing {len(frames)} images from video state", "frame_processor")
+        
+        # Skip frames that are near-identical to a more recent one (static scene).
+        # If no frames remain, OpenAI.frameAnalysis sends a text-only prompt.
+        frames_to_send = _dedupe_frames(frames)
+        if len(frames_to_send) < len(frames):
+            log_message("info", f"Sending {len(frames_to_send)} distinct frame(s) after deduplication", "frame_processor")
+        
+        return prompt_text, frames_to_send, current_step
 
-Your job is to analyze whether the user is:
-- Correctly executing the current task
-- Has completed the current task and ready to move to the next
-- Has become derailed or is performing the wrong action
-"""
+    @staticmethod
+    def _build_task_context(is_first_step: bool, previous_step: 'Step', current_step: 'Step', next_step: 'Step') -> Tuple[str, str]:
+        """
+        Builds the previous/current/next step section of the prompt.
 
+        Args:
+            is_first_step: Whether the current step is the first step of the task.
+            previous_step: The step before the current index.
+            current_step: The step at the current index.
+            next_step: The step after the current index.
+
+        Returns:
+            A tuple of (human-readable current step, task context prompt section).
+        """
+        current_step_text = current_step.to_human_readable()
+        next_step_text = next_step.to_human_readable()
+        
         # 2. Add previous, current, and next task information
         if is_first_step:
             prompt_tasks = f"""
 TASK CONTEXT:
 - This is the first step of the human's goal
-- Current step: {current_step.to_human_readable()}
-- Next step: {next_step.to_human_readable()}
+- Current step: {current_step_text}
+- Next step: {next_step_text}
 """
         else:
             prompt_tasks = f"""
 TASK CONTEXT:
 - Previous step: {previous_step.to_human_readable()}
-- Current step: {current_step.to_human_readable()}
-- Next step: {next_step.to_human_readable()}
+- Current step: {current_step_text}
+- Next step: {next_step_text}
 """
+        return current_step_text, prompt_tasks
 
-        # 3. Add the required response format instructions
-        prompt_format_instructions = """
-RESPONSE FORMAT:
-Return a JSON object with the following structure based on your analysis:
-
-If the user is correctly working on the current task:
-{
-    "status": "executing_task"
-}
-
-If the user has completed the current task and should proceed to the next step:
-{
-    "status": "completed_task"
-}
-
-If the user is doing something incorrect or unrelated to the current task:
-{
-    "status": "derailed",
-    "focus_objects": ["object1", "object2"],  
-    "action": "precise action description with these objects"
-}
-
-In all cases, the status field is required. The focus_objects and action fields are only required for "derailed" status.
-"""
+    @staticmethod
+    def _handle_response(response_str: str, task_state: 'TaskState', current_step: 'Step', latest_frame: Optional[bytes], allow_visualization: bool, offload_visualization: bool = False) -> TaskStatus:
+        """
+        Parses the model response into a status and creates the result visualization.
 
-        # Combine all parts of the prompt
-        prompt_text = f"{prompt_intro}\n{prompt_tasks}\n{prompt_format_instructions}"
+        Args:
+            response_str: The raw text returned by the model.
+            task_state: The current state of the task.
+            current_step: The step the user is expected to be executing.
+            latest_frame: Encoded bytes of the most recent frame sent to the model, if any.
+            allow_visualization: Flag to control whether to create and send visualizations
+            offload_visualization: Render the visualization on the event loop's default executor
+                instead of before returning. Requires a running event loop.
 
-        # Get image paths from video_state
-        # Assuming get_images() returns a list of paths, newest last.
-        # We'll take up to the 3 most recent images as suggested by the prompt ("current", "1s ago", "2s ago")
-        all_image_paths = video_state.get_images()
-        
-        # Log how many images we have
-        log_message("info", f"Processing {len(all_image_paths)} images from video state", "frame_processor")
-        
-        # Ensure we only pass paths that exist or handle appropriately in OpenAI.frameAnalysis
-        # OpenAI.frameAnalysis takes a list of paths; if empty, it sends a text-only prompt.
-        image_paths_to_send = all_image_paths[-3:] if all_image_paths else []
-        
-        # Log the most recent image to the GUI
-        if image_paths_to_send and allow_visualization:
-            latest_image_path = image_paths_to_send[-1]
+        Returns:
+            TaskStatus: A literal status string - 'executing_task', 'completed_task', 'derailed', or 'error'
+        """
+        # Parse the response string to extract JSON
+        try:
+            # Try to parse the entire response as JSON
+            response_data = orjson.loads(response_str)
             
-            try:
-                # Load the image for visualization
-                img = Image.open(latest_image_path)
-                
-                # Create a visualization with task info
-                vis_img = img.copy()
-                draw = ImageDraw.Draw(vis_img)
-                
-                # Add a text overlay with task information
-                text = f"Task: {task_state.task.name}\nStep {task_state.index + 1}: {current_step.get_action()}"
-                
-                # Add semi-transparent overlay at top
-                overlay_height = 60
-                draw.rectangle([(0, 0), (vis_img.width, overlay_height)], fill=(0, 0, 0, 128))
-                
-                # Add text
+            # Get the status
+            status = response_data.get("status", "error")
+            
+            # Log the result
+            log_message("info", f"Frame processing result: {status}", "frame_processor")
+            
+            # If status is "derailed", log the focus objects and action
+            if status == "derailed" and "focus_objects" in response_data:
+                focus_objects = response_data.get("focus_objects", [])
+                action = response_data.get("action", "")
+                log_message("warning", f"User is derailed. Focus on: {', '.join(focus_objects)}", "frame_processor")
+                log_message("warning", f"Suggested action: {action}", "frame_processor")
+            
+            # Create a single visualization of the latest frame with task info and result
+            if latest_frame is not None and allow_visualization:
+                # Snapshot the task position now; the caller may advance task_state before an offloaded render runs
+                vis_args = (latest_frame, task_state.task.name, task_state.index + 1, current_step, status, response_data)
+                if offload_visualization:
+                    # Fire and forget: the status is not held back by the JPEG encode
+                    asyncio.get_running_loop().run_in_executor(None, processFrame._visualize_result, *vis_args)
+                else:
+                    processFrame._visualize_result(*vis_args)
+            
+            # Return the status
+            return status
+            
+        except orjson.JSONDecodeError:
+            # If the response isn't valid JSON, try to extract JSON from the text
+            json_match = _JSON_RE.search(response_str)
+            if json_match:
                 try:
-                    # Try to use a system font
-                    font = ImageFont.truetype("Arial", 16)
-                except:
-                    # Fall back to default font
-                    font = ImageFont.load_default()
+                    json_str = json_match.group(0)
+                    response_data = orjson.loads(json_str)
                     
-                draw.text((10, 10), text, fill=(255, 255, 255), font=font)
-                
-                # Save the visualization
-                tmp_dir = os.path.join(os.getcwd(), "media", "tmp_frames")
-                os.makedirs(tmp_dir, exist_ok=True)
-                vis_path = os.path.join(tmp_dir, f"frame_process_{uuid.uuid4()}.jpg")
-                vis_img.convert("RGB").save(vis_path)
-                
-                # Log the visualization to the GUI
-                metadata = {
-                    "width": vis_img.width,
-                    "height": vis_img.height,
-                    "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "visualization": True,
-                    "task_name": task_state.task.name,
-                    "step_number": task_state.index + 1,
-                    "step_action": current_step.get_action()
-                }
-                image_received(vis_path, metadata, "frame_processor")
-                
-            except Exception as e:
-                print(f"Error creating frame visualization: {e}")
-                traceback.print_exc()
-                log_message("error", f"Error creating frame visualization: {str(e)}", "frame_processor")
+                    # Get and log the status
+                    status = response_data.get("status", "error")
+                    log_message("info", f"Frame processing result: {status}", "frame_processor")
+                    
+                    # Return the status
+                    return status
+                    
+                except orjson.JSONDecodeError:
+                    # If we still can't parse the JSON, return an error
+                    if _DEBUG:
+                        traceback.print_exc()
+                    log_message("error", "Failed to parse JSON from response", "frame_processor")
+                    return "error"
+            else:
+                # No JSON-like structure found
+                log_message("error", "No JSON structure found in response", "frame_processor")
+                return "error"
+
+    @staticmethod
+    def _report_error(error_msg: str) -> TaskStatus:
+        """Logs a failed frame analysis and returns the 'error' status."""
+        if _DEBUG:
+            traceback.print_exc()
+        log_message("error", error_msg, "frame_processor")
+        
+        return "error"
 
+    @staticmethod
+    def _visualize_result(frame: bytes, task_name: str, step_number: int, current_step: 'Step', status: TaskStatus, response_data: dict) -> None:
+        """
+        Draws the task overlay and the status overlay on one copy of the frame and sends it to the GUI.
+
+        Both overlays share a single decode, JPEG encode and image_received event per frame.
+
+        Args:
+            frame: Encoded bytes of the most recent frame
+            task_name: Name of the active task
+            step_number: 1-based number of the current step
+            current_step: The step the user is expected to be executing
+            status: The status returned by the model
+            response_data: The parsed model response
+        """
         try:
-            # Call OpenAI for analysis
-            response_str = OpenAI.frameAnalysis(prompt=prompt_text, image_paths=image_paths_to_send)
+            # Decode the bytes already read for the upload; nothing is written back,
+            # so draw directly on the decoded RGB image instead of a copy
+            vis_img = Image.open(io.BytesIO(frame)).convert("RGB")
+            draw = ImageDraw.Draw(vis_img)
             
-            # Parse the response string to extract JSON
-            try:
-                # Try to parse the entire response as JSON
-                response_data = json.loads(response_str)
-                
-                # Get the status
-                status = response_data.get("status", "error")
-                
-                # Log the result
-                log_message("info", f"Frame processing result: {status}", "frame_processor")
-                
-                # If status is "derailed", log the focus objects and action
-                if status == "derailed" and "focus_objects" in response_data:
-                    focus_objects = response_data.get("focus_objects", [])
-                    action = response_data.get("action", "")
-                    log_message("warning", f"User is derailed. Focus on: {', '.join(focus_objects)}", "frame_processor")
-                    log_message("warning", f"Suggested action: {action}", "frame_processor")
-                
-                # Create visualization of latest frame with result
-                if image_paths_to_send and allow_visualization:
-                    try:
-                        # Load the image
-                        img = Image.open(image_paths_to_send[-1])
-                        
-                        # Create visualization
-                        vis_img = img.copy()
-                        draw = ImageDraw.Draw(vis_img)
-                        
-                        # Add a colored overlay at bottom based on status
-                        overlay_height = 80
-                        overlay_y = vis_img.height - overlay_height
-                        
-                        # Color based on status
-                        if status == "executing_task":
-                            color = (0, 128, 0, 180)  # Green
-                            text = "Status: EXECUTING TASK"
-                        elif status == "completed_task":
-                            color = (0, 0, 255, 180)  # Blue
-                            text = "Status: COMPLETED TASK"
-                        elif status == "derailed":
-                            color = (255, 0, 0, 180)  # Red
-                            text = "Status: DERAILED"
-                            # Add additional info for derailed status
-                            if "focus_objects" in response_data:
-                                focus_objects = response_data.get("focus_objects", [])
-                                text += f"\nFocus on: {', '.join(focus_objects)}"
-                        else:
-                            color = (128, 128, 128, 180)  # Gray
-                            text = "Status: ERROR"
-                            
-                        # Draw overlay
-                        draw.rectangle([(0, overlay_y), (vis_img.width, vis_img.height)], fill=color)
-                        
-                        # Add text
-                        try:
-                            font = ImageFont.truetype("Arial", 16)
-                        except:
-                            font = ImageFont.load_default()
-                            
-                        draw.text((10, overlay_y + 10), text, fill=(255, 255, 255), font=font)
-                        
-                        # Save visualization
-                        vis_result_path = os.path.join(tmp_dir, f"result_{uuid.uuid4()}.jpg")
-                        vis_img.convert("RGB").save(vis_result_path)
-                        
-                        # Log visualization to GUI
-                        result_metadata = {
-                            "width": vis_img.width,
-                            "height": vis_img.height,
-                            "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            "visualization": True,
-                            "status": status
-                        }
-                        image_received(vis_result_path, result_metadata, "frame_processor")
-                        
-                    except Exception as e:
-                        print(f"Error creating result visualization: {e}")
-                        traceback.print_exc()
-                        log_message("error", f"Error creating result visualization: {str(e)}", "frame_processor")
-                
-                # Return the status
-                return status
-                
-            except json.JSONDecodeError:
-                # If the response isn't valid JSON, try to extract JSON from the text
-                import re
-                json_match = re.search(r'{.*}', response_str, re.DOTALL)
-                if json_match:
-                    try:
-                        json_str = json_match.group(0)
-                        response_data = json.loads(json_str)
-                        
-                        # Get and log the status
-                        status = response_data.get("status", "error")
-                        log_message("info", f"Frame processing result: {status}", "frame_processor")
-                        
-                        # Return the status
-                        return status
-                        
-                    except json.JSONDecodeError:
-                        # If we still can't parse the JSON, return an error
-                        print("Error: Failed to parse JSON from extracted text")
-                        traceback.print_exc()
-                        log_message("error", "Failed to parse JSON from response", "frame_processor")
-                        return "error"
-                else:
-                    # No JSON-like structure found
-                    print("Error: No JSON-like structure found in response")
-                    log_message("error", "No JSON structure found in response", "frame_processor")
-                    return "error"
+            # Add semi-transparent overlay at top with task information
+            text = f"Task: {task_name}\nStep {step_number}: {current_step.get_action()}"
+            draw.rectangle([(0, 0), (vis_img.width, 60)], fill=(0, 0, 0, 128))
+            draw.text((10, 10), text, fill=(255, 255, 255), font=_FONT)
             
-        except RuntimeError as e:
-            # Log the error or handle it as per application requirements
-            error_msg = f"Error during OpenAI frame analysis: {e}"
-            print(error_msg)
-            traceback.print_exc()
-            log_message("error", error_msg, "frame_processor")
+            # Add a colored overlay at bottom based on status
+            overlay_height = 80
+            overlay_y = vis_img.height - overlay_height
+            color, text = _STATUS_STYLES.get(status, _ERROR_STYLE)
+            if status == "derailed" and "focus_objects" in response_data:
+                # Add additional info for derailed status
+                focus_objects = response_data.get("focus_objects", [])
+                text += f"\nFocus on: {', '.join(focus_objects)}"
+            draw.rectangle([(0, overlay_y), (vis_img.width, vis_img.height)], fill=color)
+            draw.text((10, overlay_y + 10), text, fill=(255, 255, 255), font=_FONT)
             
-            return "error"
+            # Save visualization with a fast, fixed JPEG encoding; it is only shown in the GUI
+            vis_path = os.path.join(_tmp_dir(), f"result_{uuid.uuid4()}.jpg")
+            vis_img.save(vis_path, "JPEG", quality=72, subsampling=2, optimize=False, progressive=False)
             
-        except Exception as e:
-            error_msg = f"An unexpected error occurred in processFrame: {e}"
-            print(error_msg)
-            traceback.print_exc()
-            log_message("error", error_msg, "frame_processor")
+            # Log visualization to GUI
+            metadata = {
+                "width": vis_img.width,
+                "height": vis_img.height,
+                "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "visualization": True,
+                "task_name": task_name,
+                "step_number": step_number,
+                "step_action": current_step.get_action(),
+                "status": status
+            }
+            image_received(vis_path, metadata, "frame_processor")
             
-            return "error"
+        except Exception as e:
+            if _DEBUG:
+                traceback.print_exc()
+            log_message("error", f"Error creating result visualization: {str(e)}", "frame_processor")
 
     @staticmethod
     def handle_analysis_result(result: TaskStatus, task_state: 'TaskState') -> None:
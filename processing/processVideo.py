@@ -62,7 +62,7 @@ class processVideo:
             
             if isinstance(parsed_json, dict) and "steps" in parsed_json and isinstance(parsed_json["steps"], list):
                 actual_steps_list = parsed_json["steps"]
-                task_object = Task(name=task_name_base, task_list=actual_steps_list)
+                task_object = Task.from_dict({"name": task_name_base, "steps": actual_steps_list})
                 print(f"Successfully created Task: {task_object.name} with {len(actual_steps_list)} steps.")
             else:
                 malformed_response_detail = str(analysis_result)[:200] + ("..." if len(str(analysis_result)) > 200 else "")
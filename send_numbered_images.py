@@ -9,6 +9,8 @@ import pathlib
 import time
 import re
 import logging
+import hashlib
+import struct
 import argparse
 from tqdm import tqdm
 import websockets
@@ -16,7 +18,8 @@ import os
 from PIL import Image
 import io
 import json
-from datetime import datetime
+import orjson
+from concurrent.futures import ProcessPoolExecutor
 
 # Configure logging
 logging.basicConfig(
@@ -30,46 +33,113 @@ logger = logging.getLogger(__name__)
 MAX_IMAGE_SIZE = (512, 512)  # Maximum dimensions for images
 MAX_FILE_SIZE = 1 * 1024 * 1024  # 1 MB max file size
 
+# Resized image bytes from previous runs, keyed by source path, mtime, target size and format
+_cache_dir = pathlib.Path('.resize_cache')
+
+def _resize_cache_key(image_path, mtime, image_format):
+    """Builds the resize cache key; a modified source file gets a new key."""
+    return hashlib.sha1(f"{image_path}:{mtime}:{MAX_IMAGE_SIZE}:{image_format}".encode()).hexdigest()
+
+def _load_cached_resize(key):
+    """Returns (data, width, height, format) from the resize cache, or None on a miss."""
+    data_path = _cache_dir / f"{key}.bin"
+    info_path = _cache_dir / f"{key}.json"
+    if not (data_path.exists() and info_path.exists()):
+        return None
+    info = json.loads(info_path.read_text())
+    return data_path.read_bytes(), info["width"], info["height"], info["format"]
+
+def _store_cached_resize(key, img_data, width, height, image_format):
+    """Writes a resized image to the cache; each file is written to a temp name and moved into place."""
+    _cache_dir.mkdir(exist_ok=True)
+    for suffix, content in ((".bin", img_data),
+                            (".json", json.dumps({"width": width, "height": height, "format": image_format}).encode())):
+        tmp_path = _cache_dir / f"{key}{suffix}.{os.getpid()}.tmp"
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, _cache_dir / f"{key}{suffix}")
+
+# Encode buffer reused across resizes. Not thread-safe: each resize worker process gets its own copy.
+_encode_buffer = io.BytesIO()
+
+# Number of images resized ahead of the sender
+RESIZE_QUEUE_SIZE = 4
+
+_NUM = re.compile(r'(\d+)')
+
 def natural_sort_key(s):
     """
     Sort strings containing numbers in natural order.
     E.g. ["number_1.png", "number_2.png", ..., "number_10.png"] instead of 
     ["number_1.png", "number_10.png", "number_2.png", ...]
     """
-    return [int(text) if text.isdigit() else text.lower() 
-            for text in re.split(r'(\d+)', str(s))]
+    return tuple(int(text) if text.isdigit() else text.lower()
+                 for text in _NUM.split(str(s)))
+
+def _png_dimensions(data):
+    """Returns (width, height) from a PNG's IHDR chunk, or None if the data is not a PNG."""
+    if len(data) < 24 or not data.startswith(b'\x89PNG\r\n\x1a\n'):
+        return None
+    return struct.unpack('>II', data[16:24])
 
-def resize_image_if_needed(image_path):
+def resize_image_if_needed(image_path, image_format='JPEG'):
     """
     Resize an image if it's too large and return the image data.
     
     Args:
         image_path: Path to the image file
+        image_format: PIL format used to re-encode resized images (JPEG or PNG)
         
     Returns:
-        bytes: The image data (possibly resized)
+        tuple: The image data (possibly resized), its width, its height and its format
     """
+    # First check file size
+    st = os.stat(image_path)
+    img_size = st.st_size
+    if img_size <= MAX_FILE_SIZE:
+        # Small PNGs within the size limits are sent as-is; the IHDR header is enough, no PIL decode needed
+        with open(image_path, 'rb') as f:
+            data = f.read()
+        dimensions = _png_dimensions(data)
+        if dimensions is not None and dimensions[0] <= MAX_IMAGE_SIZE[0] and dimensions[1] <= MAX_IMAGE_SIZE[1]:
+            return data, dimensions[0], dimensions[1], 'PNG'
+    
     # Open the image
     with Image.open(image_path) as img:
-        # First check file size
-        img_size = os.path.getsize(image_path)
         if img_size > MAX_FILE_SIZE or img.width > MAX_IMAGE_SIZE[0] or img.height > MAX_IMAGE_SIZE[1]:
+            # Reuse the result of an earlier run if the source has not changed
+            cache_key = _resize_cache_key(image_path, st.st_mtime, image_format)
+            cached = _load_cached_resize(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached resize of {image_path}")
+                return cached
+            
             logger.info(f"Original image size: {img.width}x{img.height}, {img_size/1024:.1f} KB")
+            # Let libjpeg decode at a reduced scale (1/2, 1/4 or 1/8) that still covers the target size
+            if img.format == 'JPEG':
+                img.draft('RGB', MAX_IMAGE_SIZE)
             # Keep aspect ratio
             img.thumbnail(MAX_IMAGE_SIZE)
             
-            # Save to memory
-            img_byte_arr = io.BytesIO()
-            img.save(img_byte_arr, format='PNG', optimize=True)
-            img_data = img_byte_arr.getvalue()
+            # Save to memory. JPEG encodes far faster than max-effort PNG and produces smaller payloads.
+            _encode_buffer.seek(0)
+            _encode_buffer.truncate()
+            if image_format == 'PNG':
+                img.save(_encode_buffer, format='PNG', optimize=True)
+            else:
+                if img.mode != 'RGB':
+                    img = img.convert('RGB')
+                img.save(_encode_buffer, format=image_format, quality=85)
+            # Release the view before the next truncate, which fails while a buffer export is alive
+            with _encode_buffer.getbuffer() as view:
+                img_data = bytes(view)
             logger.info(f"Resized to: {img.width}x{img.height}, {len(img_data)/1024:.1f} KB")
-            return img_data, img.width, img.height
+            _store_cached_resize(cache_key, img_data, img.width, img.height, image_format)
+            return img_data, img.width, img.height, image_format
         else:
-            # Image is small enough, just read it
-            with open(image_path, 'rb') as f:
-                return f.read(), img.width, img.height
+            # Image is small enough, send the bytes already read above
+            return data, img.width, img.height, img.format
 
-async def send_images_over_single_connection(image_files, host: str, port: int, delay: float = 1.0, wait_for_response: bool = True):
+async def send_images_over_single_connection(image_files, host: str, port: int, delay: float = 1.0, wait_for_response: bool = True, image_format: str = 'JPEG'):
     """
     Send all images over a single websocket connection with delay between them.
     
@@ -79,25 +149,61 @@ async def send_images_over_single_connection(image_files, host: str, port: int,
         port: WebSocket server port
         delay: Delay in seconds between sending images
         wait_for_response: Whether to wait for server response before sending next image
+        image_format: PIL format used to re-encode images that need resizing
     """
     websocket_uri = f"ws://{host}:{port}"
     logger.info(f"Connecting to {websocket_uri}...")
     
+    # Resize images in worker processes so PNG re-encoding does not block the event loop
+    loop = asyncio.get_running_loop()
+    resize_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    producer = None
+    
     try:
-        async with websockets.connect(websocket_uri) as websocket:
+        async with websockets.connect(websocket_uri, compression=None, max_size=2**22) as websocket:
             logger.info(f"Connected to {websocket_uri}")
             
-            for i, image_file in enumerate(tqdm(image_files, desc="Sending images")):
+            # Without wait_for_response, responses are collected concurrently with sending.
+            # Sends are not gated on responses: the server does not answer debounced or dropped frames.
+            sending_done = asyncio.Event()
+            
+            async def receive_responses():
+                while True:
+                    try:
+                        response = await asyncio.wait_for(websocket.recv(), timeout=1.0)
+                    except asyncio.TimeoutError:
+                        if sending_done.is_set():
+                            break
+                        continue
+                    except websockets.exceptions.ConnectionClosed:
+                        break
+                    logger.info(f"Received response: {response}")
+            
+            receiver = None if wait_for_response else asyncio.create_task(receive_responses())
+            
+            # The producer schedules resizes in file order; the bounded queue keeps it at most
+            # RESIZE_QUEUE_SIZE images ahead of the send loop below
+            prepared = asyncio.Queue(maxsize=RESIZE_QUEUE_SIZE)
+            
+            async def produce():
+                for image_file in image_files:
+                    await prepared.put((image_file, loop.run_in_executor(resize_pool, resize_image_if_needed, image_file, image_format)))
+            
+            producer = asyncio.create_task(produce())
+            
+            for i in tqdm(range(len(image_files)), desc="Sending images"):
                 start_time = time.time()
                 
                 # Get the image data
-                image_data, width, height = resize_image_if_needed(image_file)
+                image_file, resize = await prepared.get()
+                image_data, width, height, data_format = await resize
                 
                 # Create metadata message
                 metadata = {
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": time.time_ns() // 1_000_000,  # Unix epoch milliseconds
                     "width": width,
                     "height": height,
+                    "format": data_format.lower(),
                     "image_number": i + 1,
                     "total_images": len(image_files),
                     "camera_pose": {
@@ -106,13 +212,11 @@ async def send_images_over_single_connection(image_files, host: str, port: int,
                     }
                 }
                 
-                # Send metadata first
-                logger.info(f"Sending metadata for image {i+1}/{len(image_files)}: {image_file}")
-                await websocket.send(json.dumps(metadata))
-                
-                # Send the image data as binary
-                logger.info(f"Sending image: {image_file} ({len(image_data)/1024:.1f} KB)")
-                await websocket.send(image_data)
+                # Send metadata and image as one binary message: 4-byte big-endian metadata length, JSON, image.
+                # The parts go out as fragments of the same message, so the image bytes are not copied into a new buffer.
+                logger.info(f"Sending image {i+1}/{len(image_files)}: {image_file} ({len(image_data)/1024:.1f} KB)")
+                meta_bytes = orjson.dumps(metadata)
+                await websocket.send([len(meta_bytes).to_bytes(4, 'big'), meta_bytes, image_data])
                 
                 # Wait for and log the response if requested
                 if wait_for_response:
@@ -128,20 +232,19 @@ async def send_images_over_single_connection(image_files, host: str, port: int,
                     logger.info(f"Waiting {remaining_delay:.2f} second(s) before sending next image...")
                     await asyncio.sleep(remaining_delay)
             
-            # If we didn't wait for responses during the loop, collect them now
-            if not wait_for_response:
+            # If we didn't wait for responses during the loop, collect the remaining ones now
+            sending_done.set()
+            if receiver:
                 logger.info("Collecting server responses...")
-                for _ in range(len(image_files)):
-                    try:
-                        response = await asyncio.wait_for(websocket.recv(), timeout=1.0)
-                        logger.info(f"Received response: {response}")
-                    except asyncio.TimeoutError:
-                        logger.warning("Timeout waiting for server response")
-                        break
+                await receiver
                     
             logger.info("All images have been sent")
     except Exception as e:
         logger.error(f"Error during websocket communication: {e}")
+    finally:
+        if producer:
+            producer.cancel()
+        resize_pool.shutdown(cancel_futures=True)
 
 async def main_async(args):
     # Path to the directory with numbered images
@@ -161,7 +264,7 @@ async def main_async(args):
     logger.info(f"Found {len(image_files)} images to send")
     
     # Send all images over a single connection
-    await send_images_over_single_connection(image_files, args.host, args.port, args.delay, args.wait_for_response)
+    await send_images_over_single_connection(image_files, args.host, args.port, args.delay, args.wait_for_response, args.format.upper())
 
 def main():
     # Parse command line arguments
@@ -173,9 +276,18 @@ def main():
                         help="Directory containing the numbered images (default: media/numbered_images)")
     parser.add_argument("--wait-for-response", action="store_true", default=False,
                         help="Wait for server response before sending next image (default: False)")
+    parser.add_argument("--format", choices=["jpeg", "png"], default="jpeg",
+                        help="Encoding for images that need resizing (default: jpeg)")
     
     args = parser.parse_args()
     
+    # Use the libuv-based event loop where available (not on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     # Run the async main function
     asyncio.run(main_async(args))
 
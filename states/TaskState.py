@@ -12,6 +12,8 @@ class TaskState:
         _index: The current step index within the task.
     """
     
+    __slots__ = ('_task', '_index')
+
     def __init__(self, task: Task, index: int):
         """Initializes a new TaskState instance.
         
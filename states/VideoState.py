@@ -1,20 +1,87 @@
 import collections
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+def _read_file(path: str) -> Optional[bytes]:
+    """Returns the contents of a file, or None if it cannot be read."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
 
 class VideoState:
     """Manages a list of the last ten images, removing the oldest when full."""
+    __slots__ = ('images', '_image_data')
+
     def __init__(self):
         """Initializes the VideoState with a deque to hold up to ten images."""
         self.images = collections.deque(maxlen=10)
+        # Encoded contents of stored images that were already in memory when added, keyed by path
+        self._image_data: Dict[str, bytes] = {}
 
-    def add_image(self, image):
+    def add_image(self, image, data: Optional[bytes] = None):
         """
         Adds a new image to the state.
         If there are already ten images, the oldest one is automatically removed.
+
+        Args:
+            image: Path to the image file.
+            data: Optional encoded contents of the file, kept in memory so that
+                readers do not have to load it from disk again.
         """
+        if len(self.images) == self.images.maxlen:
+            self._image_data.pop(self.images[0], None)
         self.images.append(image)
+        if data is not None:
+            self._image_data[image] = data
+
+    def add_images(self, images: List[str]):
+        """
+        Adds several images at once, oldest first.
+        The files are read concurrently and their contents kept in memory; files
+        that cannot be read are added by path only.
+
+        Args:
+            images: Paths to the image files, ordered from oldest to newest.
+        """
+        if not images:
+            return
+        with ThreadPoolExecutor(max_workers=min(8, len(images))) as ex:
+            contents = list(ex.map(_read_file, images))
+        for image, data in zip(images, contents):
+            self.add_image(image, data)
 
     def get_images(self):
         """
         Returns the list of currently stored images.
         """
         return list(self.images)
+
+    def __len__(self) -> int:
+        """Returns the number of stored images without copying them."""
+        return len(self.images)
+
+    def get_recent_decoded(self, n: int = 3) -> List[Tuple[str, bytes]]:
+        """
+        Returns the n most recent images with their encoded contents, oldest first.
+
+        Contents passed to add_image are returned from memory; other images are read from disk.
+
+        Args:
+            n: Maximum number of images to return.
+
+        Returns:
+            A list of (path, bytes) tuples.
+        """
+        # Walk the newest n entries from the right end of the deque instead of copying all of it
+        recent = list(itertools.islice(reversed(self.images), max(n, 0)))
+        frames = []
+        for image in reversed(recent):
+            data = self._image_data.get(image)
+            if data is None:
+                with open(image, "rb") as image_file:
+                    data = image_file.read()
+            frames.append((image, data))
+        return frames
@@ -1,5 +1,7 @@
-from typing import List, Dict, Any
+from dataclasses import dataclass
+from typing import Dict, Any, Tuple
 
+@dataclass(frozen=True, slots=True)
 class Step:
     """Represents a single step in a task, with an action and focus objects.
     
@@ -11,32 +13,21 @@ class Step:
     }
     ```
     """
-    def __init__(self, action: str, focus_objects: List[str]):
-        """
-        Initializes a Step object.
+    action: str
+    focus_objects: Tuple[str, ...]
 
-        Args:
-            action: The action to be performed in this step.
-            focus_objects: A list of strings representing the objects of focus for this action.
-        """
-        self._action: str = action
-        self._focus_objects: List[str] = focus_objects
+    def __post_init__(self):
+        # Store focus objects as a tuple so shared steps cannot be mutated through a caller's list
+        if not isinstance(self.focus_objects, tuple):
+            object.__setattr__(self, "focus_objects", tuple(self.focus_objects))
 
     def get_action(self) -> str:
         """Returns the action of the step."""
-        return self._action
-
-    def set_action(self, action: str) -> None:
-        """Sets the action of the step."""
-        self._action = action
-
-    def get_focus_objects(self) -> List[str]:
-        """Returns the list of focus objects for the step."""
-        return self._focus_objects
+        return self.action
 
-    def set_focus_objects(self, focus_objects: List[str]) -> None:
-        """Sets the list of focus objects for the step."""
-        self._focus_objects = focus_objects
+    def get_focus_objects(self) -> Tuple[str, ...]:
+        """Returns the focus objects for the step."""
+        return self.focus_objects
 
     def to_json(self) -> Dict[str, Any]:
         """
@@ -50,8 +41,8 @@ class Step:
             }
         """
         return {
-            "action": self._action,
-            "focus_objects": self._focus_objects
+            "action": self.action,
+            "focus_objects": list(self.focus_objects)
         }
 
     def to_human_readable(self) -> str:
@@ -61,17 +52,17 @@ class Step:
         Returns:
             A string describing the action and focus objects in a more reader-friendly format.
         """
-        if self._action == "none":
+        if self.action == "none":
             return "No action required"
         
-        if not self._focus_objects:
-            return f"{self._action}"
-        elif len(self._focus_objects) == 1:
-            return f"{self._action} (object: {self._focus_objects[0]})"
+        if not self.focus_objects:
+            return f"{self.action}"
+        elif len(self.focus_objects) == 1:
+            return f"{self.action} (object: {self.focus_objects[0]})"
         else:
             # Format as "action object1, object2, and object3"
-            objects_text = ", ".join(self._focus_objects[:-1]) + f", and {self._focus_objects[-1]}"
-            return f"{self._action} (objects: {objects_text})"
+            objects_text = ", ".join(self.focus_objects[:-1]) + f", and {self.focus_objects[-1]}"
+            return f"{self.action} (objects: {objects_text})"
 
     def __repr__(self) -> str:
-        return f"Step(action='{self._action}', focus_objects={self._focus_objects})"
+        return f"Step(action='{self.action}', focus_objects={list(self.focus_objects)})"
@@ -1,7 +1,38 @@
-from typing import List, Union
+from typing import Any, Dict, List, Union
 from tasks.Step import Step # Import Step class
 
+# Returned for out-of-range indexes; Step is frozen, so one shared instance is safe
+_NO_STEP = Step(action="none", focus_objects=())
+
+def _step_from_dict(item: Dict[str, Any]) -> Step:
+    """Validates a step dictionary and converts it to a Step object."""
+    if not isinstance(item, dict):
+        raise TypeError(f"Each step must be a dictionary. Found: {type(item)}")
+    focus_objects = item.get('focus_objects')
+    action = item.get('action')
+    # Common case: well-formed steps pass these checks without looking at the details
+    if type(action) is str and type(focus_objects) is list and all(type(obj) is str for obj in focus_objects):
+        return Step(action=action, focus_objects=focus_objects)
+
+    # Validate dictionary structure to report what is wrong
+    if 'focus_objects' not in item:
+        raise ValueError(f"Step dictionary is missing 'focus_objects' key: {item}")
+    if not isinstance(focus_objects, list):
+        raise TypeError(f"'focus_objects' in a step must be a list. Found: {type(focus_objects)} in {item}")
+    for obj in focus_objects:
+        if not isinstance(obj, str):
+            raise TypeError(f"Each item in 'focus_objects' must be a string. Found: {type(obj)} in {focus_objects}")
+    
+    if 'action' not in item:
+        raise ValueError(f"Step dictionary is missing 'action' key: {item}")
+    if not isinstance(action, str):
+        raise TypeError(f"'action' in a step must be a string. Found: {type(action)} in {item}")
+    
+    return Step(action=action, focus_objects=focus_objects)
+
 class Task:
+    __slots__ = ('_name', '_task_list')
+
     # todo: accept only steps, not dicts
     def __init__(self, name: str, task_list: List[Union[Step, dict]] = None):
         self._name = name
@@ -44,32 +75,54 @@ class Task:
             if isinstance(item, Step):
                 validated_steps.append(item)
             elif isinstance(item, dict):
-                # Validate dictionary structure before creating a Step object
-                if 'focus_objects' not in item:
-                    raise ValueError(f"Step dictionary is missing 'focus_objects' key: {item}")
-                if not isinstance(item['focus_objects'], list):
-                    raise TypeError(f"'focus_objects' in a step must be a list. Found: {type(item['focus_objects'])} in {item}")
-                for obj in item['focus_objects']:
-                    if not isinstance(obj, str):
-                        raise TypeError(f"Each item in 'focus_objects' must be a string. Found: {type(obj)} in {item['focus_objects']}")
-                
-                if 'action' not in item:
-                    raise ValueError(f"Step dictionary is missing 'action' key: {item}")
-                if not isinstance(item['action'], str):
-                    raise TypeError(f"'action' in a step must be a string. Found: {type(item['action'])} in {item}")
-                
-                validated_steps.append(Step(action=item['action'], focus_objects=item['focus_objects']))
+                validated_steps.append(_step_from_dict(item))
             else:
                 raise TypeError(f"Each item in task_list must be a Step object or a dictionary. Found: {type(item)}")
         
         self._task_list = validated_steps
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the Task to a JSON-serializable dictionary accepted by from_dict."""
+        return {
+            "name": self._name,
+            "steps": [step.to_json() for step in self._task_list]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Task':
+        """
+        Creates a Task from a dictionary representation.
+
+        Args:
+            data: A dictionary with a "name" string and a "steps" list of step dictionaries.
+
+        Returns:
+            A Task whose steps were validated once while being built.
+        """
+        name = data.get("name", "")
+        if not isinstance(name, str):
+            raise TypeError("Name must be a string")
+        steps = data.get("steps")
+        if steps is None:
+            steps = []
+        if not isinstance(steps, list):
+            raise TypeError("'steps' must be a list.")
+        return cls._from_validated(name, [_step_from_dict(item) for item in steps])
+
+    @classmethod
+    def _from_validated(cls, name: str, steps: List[Step]) -> 'Task':
+        """Creates a Task from Step objects that are already known to be valid, skipping the task_list setter."""
+        task = cls.__new__(cls)
+        task._name = name
+        task._task_list = steps
+        return task
+
     def getStep(self, index: int) -> Step:
         """Returns the Step object at the specified index in the task list."""
         if not isinstance(index, int):
             raise TypeError("Index must be an integer.")
         if index < 0 or index >= len(self._task_list):
-            return Step(action="none", focus_objects=[])
+            return _NO_STEP
         return self._task_list[index]
 
     def __repr__(self):
@@ -9,8 +9,8 @@ import argparse
 import os
 from PIL import Image
 import io
-import json
-from datetime import datetime
+import orjson
+import time
 
 MAX_IMAGE_SIZE = (512, 512)  # Maximum dimensions for images
 MAX_FILE_SIZE = 1 * 1024 * 1024  # 1 MB max file size
@@ -31,6 +31,9 @@ def resize_image_if_needed(image_path):
         img_size = os.path.getsize(image_path)
         if img_size > MAX_FILE_SIZE or img.width > MAX_IMAGE_SIZE[0] or img.height > MAX_IMAGE_SIZE[1]:
             print(f"Original image size: {img.width}x{img.height}, {img_size/1024:.1f} KB")
+            # Let libjpeg decode at a reduced scale (1/2, 1/4 or 1/8) that still covers the target size
+            if img.format == 'JPEG':
+                img.draft('RGB', MAX_IMAGE_SIZE)
             # Keep aspect ratio
             img.thumbnail(MAX_IMAGE_SIZE)
             
@@ -58,12 +61,12 @@ async def send_image(websocket_uri, image_path):
         image_data, width, height = resize_image_if_needed(image_path)
         
         print(f"Connecting to {websocket_uri}...")
-        async with websockets.connect(websocket_uri) as websocket:
+        async with websockets.connect(websocket_uri, compression=None, max_size=2**22) as websocket:
             print(f"Connected to {websocket_uri}")
             
             # Create metadata message
             metadata = {
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": time.time_ns() // 1_000_000,  # Unix epoch milliseconds
                 "width": width,
                 "height": height,
                 "camera_pose": {
@@ -74,7 +77,8 @@ async def send_image(websocket_uri, image_path):
             
             # Send metadata first
             print("Sending metadata...")
-            await websocket.send(json.dumps(metadata))
+            # Metadata must go out as a text frame, so decode orjson's bytes
+            await websocket.send(orjson.dumps(metadata).decode())
             
             # Send the image data as binary
             print(f"Sending image: {image_path} ({len(image_data)/1024:.1f} KB)")
@@ -103,12 +107,12 @@ async def send_test_image(websocket_uri):
     img_byte_arr = img_byte_arr.getvalue()
     
     print(f"Connecting to {websocket_uri}...")
-    async with websockets.connect(websocket_uri) as websocket:
+    async with websockets.connect(websocket_uri, compression=None, max_size=2**22) as websocket:
         print(f"Connected to {websocket_uri}")
         
         # Create metadata message
         metadata = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": time.time_ns() // 1_000_000,  # Unix epoch milliseconds
             "width": 640,
             "height": 480,
             "camera_pose": {
@@ -119,7 +123,7 @@ async def send_test_image(websocket_uri):
         
         # Send metadata first
         print("Sending metadata...")
-        await websocket.send(json.dumps(metadata))
+        await websocket.send(orjson.dumps(metadata).decode())
         
         # Send the image data as binary
         print(f"Sending test image ({len(img_byte_arr)/1024:.1f} KB)")
@@ -138,6 +142,13 @@ def main():
     args = parser.parse_args()
     websocket_uri = f"ws://{args.host}:{args.port}"
     
+    # Use the libuv-based event loop where available (not on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     if args.image:
         if not os.path.exists(args.image):
             print(f"Error: Image file not found: {args.image}")
@@ -0,0 +1,10 @@
+from dotenv import load_dotenv
+
+_LOADED = False
+
+def ensure_env():
+    """Loads the .env file on the first call; later calls do nothing."""
+    global _LOADED
+    if not _LOADED:
+        load_dotenv()
+        _LOADED = True
@@ -0,0 +1,33 @@
+import os
+import sys
+
+_INSERTED = False
+
+# Test assets on the Desktop, resolved once at import
+_DESKTOP = os.path.join(os.path.expanduser("~"), "Desktop")
+_VIDEO_NAME = "video1.MOV"
+_VIDEO = os.path.join(_DESKTOP, _VIDEO_NAME)
+_IMAGE_NAMES = ("ar-image.png", "ar-image2.png", "ar-image3.png") # Oldest to newest
+_IMAGES = tuple(os.path.join(_DESKTOP, name) for name in _IMAGE_NAMES)
+
+def _ensure_path():
+    """Adds the project root to sys.path to allow for imports from processing, states and tasks; runs once."""
+    global _INSERTED
+    if _INSERTED:
+        return
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    _INSERTED = True
+
+def _check_desktop_assets(desktop_path, needed):
+    """
+    Returns the names in needed that are not regular files in desktop_path.
+
+    Uses a single os.scandir; DirEntry.is_file() answers from the directory entry's
+    type, so no per-file stat() is made except for symlinks.
+    """
+    try:
+        with os.scandir(desktop_path) as entries:
+            found = {entry.name for entry in entries if entry.name in needed and entry.is_file()}
+    except FileNotFoundError:
+        found = set()
+    return set(needed) - found
@@ -0,0 +1,3 @@
+from tests._paths import _ensure_path
+
+_ensure_path()
@@ -1,18 +1,51 @@
-import sys
 import os
-from dotenv import load_dotenv
-
-# Add the project root to sys.path to allow for imports
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-
-from processing.processVideo import processVideo
-from processing.processFrame import processFrame
+import json
+import hashlib
+from typing import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+if __name__ == "__main__" and not __package__:
+    # Running as a script (not with -m): put the project root on sys.path
+    import _paths
+    _paths._ensure_path()
+
+from tests._env import ensure_env
+from tests._paths import _DESKTOP, _VIDEO, _VIDEO_NAME, _IMAGE_NAMES, _IMAGES, _check_desktop_assets
 from tasks.Task import Task
 from states.TaskState import TaskState
 from states.VideoState import VideoState
 
+# processVideo results from earlier runs, keyed by the SHA-256 of the video file
+_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+def cached_process_video(video_file_path: str, process_video: Callable[[str], Task]) -> Task:
+    """Returns process_video's Task for the video, reusing the result of an earlier run if the video is unchanged."""
+    with open(video_file_path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+: hashes straight from the file's buffer without Python-level chunking
+            sha = hashlib.file_digest(f, "sha256")
+        else:
+            sha = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+    cache_file = os.path.join(_CACHE_DIR, f"{sha.hexdigest()}.json")
+
+    if os.access(cache_file, os.F_OK):
+        print(f"Using cached video processing result: {cache_file}")
+        with open(cache_file, "r") as f:
+            return Task.from_dict(json.load(f))
+
+    task = process_video(video_file_path)
+    # Only cache successful results so a failed API call is retried on the next run;
+    # processVideo names every failure Task "<basename> - <error kind>", so the bare basename means success
+    if task.name == os.path.basename(video_file_path) and task.task_list:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(task.to_dict(), f)
+        os.replace(tmp_file, cache_file)
+    return task
+
 def test_end2end():
     """
     Performs an end-to-end test:
@@ -21,19 +54,26 @@ def test_end2end():
     3. Creates a VideoState with predefined images.
     4. Calls processFrame with these states.
     """
-    load_dotenv() # Load OPENAI_API_KEY and GOOGLE_API_KEY
+    # Deferred: these pull in the Gemini, OpenAI and detection clients. Imported outside the
+    # try blocks below so a missing dependency fails the test instead of being printed
+    from processing.processVideo import processVideo
+    from processing.processFrame import processFrame
+    ensure_env() # Load OPENAI_API_KEY and GOOGLE_API_KEY
     print("Starting end-to-end test...")
 
     # --- Part 1: Video Processing (similar to test_video_processing.py) ---
     print("\n--- Stage 1: Video Processing ---")
-    desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
-    video_file_path = os.path.join(desktop_path, "video1.MOV")
+    desktop_path = _DESKTOP
+    video_file_path = _VIDEO
+
+    # Check all four assets with one Desktop listing instead of probing each file separately
+    missing = _check_desktop_assets(desktop_path, {_VIDEO_NAME, *_IMAGE_NAMES})
 
     print(f"Attempting to process video: {video_file_path}")
 
     resulting_task: Task = None # Initialize to None
 
-    if not os.path.exists(video_file_path):
+    if _VIDEO_NAME in missing:
         print(f"ERROR: Video file not found at {video_file_path}. Cannot proceed with end-to-end test.")
         # Create a dummy error Task object to allow the test structure to complete if needed for other checks
         # but for an e2e test, this usually means failure.
@@ -46,9 +86,17 @@ def test_end2end():
         print("End-to-end test cannot fully complete due to missing video file.")
         return # Exit if video file is not found
 
+    # Read the Stage 2 images in the background while the video is being analysed
+    video_state = VideoState()
+    images_loaded = None
+    if missing.isdisjoint(_IMAGE_NAMES):
+        loader = ThreadPoolExecutor(max_workers=1)
+        images_loaded = loader.submit(video_state.add_images, list(_IMAGES))
+        loader.shutdown(wait=False) # The submitted load still runs to completion
+
     try:
         print("\nEnsure your GOOGLE_API_KEY environment variable is set for video processing.")
-        resulting_task = processVideo.processVideo(video_file_path)
+        resulting_task = cached_process_video(video_file_path, processVideo.processVideo)
 
         print("\nVideo processing finished.")
         print("Resulting Task Object from video processing:")
@@ -92,37 +140,19 @@ def test_end2end():
     print(f"Created TaskState at index {task_state.index} for task '{task_state.task.name}'")
     print(f"Current step for frame processing: {task_state.getCurrentStep()}")
 
-    # 2. Create VideoState with predefined images (as in test_frame_processing.py)
-    video_state = VideoState()
-    image_path_oldest = os.path.join(desktop_path, "ar-image.png")
-    image_path_middle = os.path.join(desktop_path, "ar-image2.png")
-    image_path_newest = os.path.join(desktop_path, "ar-image3.png")
-
+    # 2. Fill VideoState with predefined images (as in test_frame_processing.py)
     # Check if images exist before adding
-    images_to_add = []
-    if os.path.exists(image_path_oldest):
-        images_to_add.append(image_path_oldest)
-    else:
-        print(f"WARNING: Image not found: {image_path_oldest}")
-    if os.path.exists(image_path_middle):
-        images_to_add.append(image_path_middle)
-    else:
-        print(f"WARNING: Image not found: {image_path_middle}")
-    if os.path.exists(image_path_newest):
-        images_to_add.append(image_path_newest)
-    else:
-        print(f"WARNING: Image not found: {image_path_newest}")
-    
-    if not images_to_add or len(images_to_add) < 3:
-         print(f"ERROR: One or more required images for frame processing not found on Desktop.")
+    missing_images = [path for name, path in zip(_IMAGE_NAMES, _IMAGES) if name in missing]
+    if missing_images:
+         print(f"ERROR: Images not found: {missing_images}")
          print(f"Please ensure 'ar-image.png', 'ar-image2.png', and 'ar-image3.png' exist on your Desktop.")
          print("End-to-end test cannot fully complete due to missing image files for frame processing.")
          return
 
-    for img_path in images_to_add:
-        video_state.add_image(img_path)
+    images_loaded.result() # Started before video processing; usually already done
+    for img_path in _IMAGES:
         print(f"Added image to VideoState: {img_path}")
-    print(f"Created VideoState with {len(video_state.get_images())} image(s).")
+    print(f"Created VideoState with {len(video_state)} image(s).")
 
     # 3. Call processFrame.processFrame()
     print("\nCalling processFrame.processFrame()...")
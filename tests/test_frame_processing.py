@@ -1,35 +1,26 @@
-import sys
-import os
+if __name__ == "__main__" and not __package__:
+    # Running as a script (not with -m): put the project root on sys.path
+    import _paths
+    _paths._ensure_path()
 
-# Add the project root to sys.path to allow for imports
-# Assumes the tests directory is directly under the project root (AR3)
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-
-from processing.processFrame import processFrame
+from tests._env import ensure_env
+from tests._paths import _IMAGES
 from states.VideoState import VideoState
 from states.TaskState import TaskState
 from tasks.Task import Task
 from tasks.Step import Step # Though Task can handle dicts, good for clarity if needed
-from dotenv import load_dotenv
 
 def test_frame_processing():
     """Tests the processFrame function with a predefined task list and empty video state."""
-    load_dotenv() # Ensure environment variables like OPENAI_API_KEY are loaded
+    from processing.processFrame import processFrame # Deferred: pulls in the OpenAI and detection clients
+    ensure_env() # Ensure environment variables like OPENAI_API_KEY are loaded
     print("Starting frame processing test...")
 
     # 1. Create VideoState object and add test image
     video_state = VideoState()
-    desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
-    
-    image_path_oldest = os.path.join(desktop_path, "ar-image.png")
-    image_path_middle = os.path.join(desktop_path, "ar-image2.png")
-    image_path_newest = os.path.join(desktop_path, "ar-image3.png")
+    image_path_oldest, image_path_middle, image_path_newest = _IMAGES
 
-    video_state.add_image(image_path_oldest) # Oldest
-    video_state.add_image(image_path_middle) # Middle
-    video_state.add_image(image_path_newest) # Newest
+    video_state.add_images(list(_IMAGES))
     
     print(f"Created VideoState: {video_state}")
     print(f"Added oldest image: {image_path_oldest}")
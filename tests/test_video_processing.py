@@ -1,32 +1,30 @@
-import sys
 import os
-from dotenv import load_dotenv
 
-# Add the project root to sys.path to allow for imports from processing and tasks
-# Assumes the tests directory is directly under the project root (AR3)
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
+if __name__ == "__main__" and not __package__:
+    # Running as a script (not with -m): put the project root on sys.path
+    import _paths
+    _paths._ensure_path()
 
-from processing.processVideo import processVideo
+from tests._env import ensure_env
+from tests._paths import _VIDEO
 from tasks.Task import Task # Though not directly used here, good to ensure it can be found if processVideo returns it
 
 def test_video_processing():
     """
     Tests the processVideo function with a video from the user's desktop.
     """
-    load_dotenv()
+    from processing.processVideo import processVideo # Deferred: pulls in the Gemini client
+    ensure_env()
     print("Starting video processing test...")
     
     # Construct the path to the video on the desktop
     # User's workspace is /Users/michaelbonacina/Desktop/AR3
     # Desktop path should be /Users/michaelbonacina/Desktop/
-    desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
-    video_file_path = os.path.join(desktop_path, "video1.MOV")
+    video_file_path = _VIDEO
 
     print(f"Attempting to process video: {video_file_path}")
 
-    if not os.path.exists(video_file_path):
+    if not os.access(video_file_path, os.F_OK):
         print(f"ERROR: Video file not found at {video_file_path}")
         print("Please ensure 'video1.MOV' exists on your Desktop.")
         # Create a dummy error Task object to simulate what processVideo might return on error
@@ -1,28 +1,68 @@
 import sys
-import os
+import importlib
+import io
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
 print(f"Python executable: {sys.executable}")
 print(f"Python version: {sys.version}")
 print(f"sys.path: {sys.path}")
 
-from dotenv import load_dotenv
+if __name__ == "__main__" and not __package__:
+    # Running as a script (not with -m): put the project root on sys.path
+    import _paths
+    _paths._ensure_path()
 
-# Add the project root to sys.path to allow for imports from processing and tasks
-# Assumes the tests directory is directly under the project root (AR3)
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
+from tests._env import ensure_env
 
-# Import the test function from the new file
-from tests.test_video_processing import test_video_processing
-from tests.test_frame_processing import test_frame_processing
-from tests.test_end2end import test_end2end
-from tests.upload_video import upload_video # Import the new upload_video function
+class _PerThreadStdout(io.TextIOBase):
+    """Sends prints from threads that registered a buffer to that buffer, so concurrent tests do not interleave."""
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (self._stream if buffer is None else buffer).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+def _run_buffered(test, stdout: _PerThreadStdout) -> Tuple[str, bool]:
+    """Runs a test function with its output captured, and returns that output and whether the test raised."""
+    stdout._local.buffer = io.StringIO()
+    failed = False
+    try:
+        test()
+    except Exception:
+        traceback.print_exc(file=sys.stdout)
+        failed = True
+    return stdout._local.buffer.getvalue(), failed
 
 if __name__ == "__main__":
     print("Executing tests from tests.py...")
+    ensure_env() # Load the API keys once before the tests start in parallel
+
+    # Import the test modules only when running them, so importing tests.py stays cheap
+    test_video_processing = importlib.import_module("tests.test_video_processing").test_video_processing
+    test_frame_processing = importlib.import_module("tests.test_frame_processing").test_frame_processing
 
-    test_video_processing()
-    test_frame_processing()
+    # Both tests mostly wait on external APIs (Gemini and OpenAI), so run them side by side
+    # and print each one's output once it finishes
+    stdout = _PerThreadStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            futures = [ex.submit(_run_buffered, test, stdout) for test in (test_video_processing, test_frame_processing)]
+            results = [future.result() for future in futures]
+    finally:
+        sys.stdout = stdout._stream
+    for output, _ in results:
+        print(output, end="")
+    # A test that raised fails the run, as it would have without the buffering
+    if any(failed for _, failed in results):
+        sys.exit(1)
 
 
     
@@ -1,50 +1,116 @@
 import os
+import orjson
+import socket
+import uuid
+import http.client
+from urllib.parse import urlparse
 import requests # For making HTTP requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+if __name__ == '__main__' and not __package__:
+    # Running as a script (not with -m): put the project root on sys.path
+    import _paths
+    _paths._ensure_path()
+
+from tests._paths import _VIDEO
+
+try:
+    # Streams the multipart body from the file instead of building it in memory
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
 
 # Define the target URL for the video upload endpoint
 # Ensure this matches the FLASK_PORT in your main.py (currently 6000)
 UPLOAD_URL = "http://localhost:6000/video_upload"
 VIDEO_FILENAME = "video1.MOV"
 
+# Shared session so repeated uploads reuse the keep-alive connection.
+# Retry's default allowed_methods leaves out POST, so only failed connection attempts are retried;
+# a streamed body that was already sent cannot be replayed.
+_SESSION = requests.Session()
+_SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=4,
+                                      max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])))
+
+def _post_with_sendfile(video_file_path):
+    """
+    Posts the video as multipart/form-data over a raw socket, sending the file body with
+    socket.sendfile so the kernel copies it straight from the file to the socket.
+
+    Returns:
+        tuple: The response status code and body bytes.
+    """
+    url = urlparse(UPLOAD_URL)
+    boundary = uuid.uuid4().hex
+    part_head = (f'--{boundary}\r\n'
+                 f'Content-Disposition: form-data; name="file"; filename="{VIDEO_FILENAME}"\r\n'
+                 f'Content-Type: video/quicktime\r\n\r\n').encode()
+    part_tail = f'\r\n--{boundary}--\r\n'.encode()
+    content_length = len(part_head) + os.path.getsize(video_file_path) + len(part_tail)
+    request_head = (f'POST {url.path} HTTP/1.1\r\n'
+                    f'Host: {url.netloc}\r\n'
+                    f'Content-Type: multipart/form-data; boundary={boundary}\r\n'
+                    f'Content-Length: {content_length}\r\n'
+                    f'Connection: close\r\n\r\n').encode()
+
+    with socket.create_connection((url.hostname, url.port or 80), timeout=120) as sock, open(video_file_path, 'rb') as f:
+        sock.sendall(request_head + part_head)
+        sock.sendfile(f)
+        sock.sendall(part_tail)
+        response = http.client.HTTPResponse(sock)
+        response.begin()
+        return response.status, response.read()
+
 def upload_video():
     """Uploads 'video1.MOV' from the user's desktop to the /video_upload endpoint."""
     print(f"Attempting to upload {VIDEO_FILENAME} to {UPLOAD_URL}...")
 
-    desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
-    video_file_path = os.path.join(desktop_path, VIDEO_FILENAME)
+    video_file_path = _VIDEO
 
-    if not os.path.exists(video_file_path):
+    if not os.access(video_file_path, os.F_OK):
         print(f"ERROR: Video file not found at {video_file_path}")
         print("Please ensure 'video1.MOV' exists on your Desktop.")
         return False
 
     try:
-        with open(video_file_path, 'rb') as f:
-            files = {'file': (VIDEO_FILENAME, f, 'video/quicktime')} # Adjust mime type if needed
-            response = requests.post(UPLOAD_URL, files=files, timeout=120) # Added timeout
+        if urlparse(UPLOAD_URL).hostname in ('localhost', '127.0.0.1'):
+            # Local server: zero-copy upload, no remote hops that would need requests' retries
+            status_code, body = _post_with_sendfile(video_file_path)
+        else:
+            with open(video_file_path, 'rb') as f:
+                file_field = (VIDEO_FILENAME, f, 'video/quicktime') # Adjust mime type if needed
+                if MultipartEncoder is not None:
+                    encoder = MultipartEncoder(fields={'file': file_field})
+                    response = _SESSION.post(UPLOAD_URL, data=encoder, headers={'Content-Type': encoder.content_type}, stream=True, timeout=120)
+                else:
+                    response = _SESSION.post(UPLOAD_URL, files={'file': file_field}, stream=True, timeout=120) # Added timeout
+            # Read the body in chunks (gzip is decoded by iter_content) instead of letting requests buffer it
+            with response:
+                status_code, body = response.status_code, b''.join(response.iter_content(chunk_size=65536))
         
-        print(f"Upload attempt finished. Status Code: {response.status_code}")
+        print(f"Upload attempt finished. Status Code: {status_code}")
         try:
-            response_json = response.json()
+            response_json = orjson.loads(body)
             print("Server Response (JSON):")
             print(response_json)
-            if response.status_code == 201 and response_json.get("message"):
+            if status_code == 201 and response_json.get("message"):
                 print(f"Success: {response_json.get('message')}")
                 return True
             else:
                 print(f"Upload failed or server returned an error: {response_json.get('error', 'No error message provided.')}")
                 return False
-        except requests.exceptions.JSONDecodeError:
+        except orjson.JSONDecodeError:
             print("Server Response (Non-JSON):")
-            print(response.text)
+            print(body.decode('utf-8', errors='replace'))
             print("Upload may have failed or server returned non-JSON error.")
             return False
 
-    except requests.exceptions.ConnectionError as e:
+    except (requests.exceptions.ConnectionError, ConnectionRefusedError) as e:
         print(f"Connection Error: Could not connect to the server at {UPLOAD_URL}. Ensure the server is running.")
         print(f"Details: {e}")
         return False
-    except requests.exceptions.Timeout as e:
+    except (requests.exceptions.Timeout, socket.timeout) as e:
         print(f"Timeout Error: The request to {UPLOAD_URL} timed out.")
         print(f"Details: {e}")
         return False